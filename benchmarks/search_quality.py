@@ -31,30 +31,61 @@ Usage:
     # Skip lifting entirely (unlifted baseline only)
     python3 benchmarks/search_quality.py --no-lift
 
+    # Ignore cached search results (they are keyed on binary + graph)
+    python3 benchmarks/search_quality.py --measure-only --no-cache-search
+
     # Custom binary
     python3 benchmarks/search_quality.py --rpg-binary ./target/debug/rpg-encoder
 
 Requires:
     - rpg-encoder binary (cargo build --release)
     - An LLM provider (Moonshot, OpenAI, Anthropic, or Ollama) for lifting
+    - numpy (bootstrap confidence interval)
+    - Optional: ijson (streams large graph.json files instead of loading them)
+    - Optional: orjson (faster results.json encoding)
 """
 
 import argparse
+import hashlib
 import json
 import os
-import random
+import queue
 import re
+import selectors
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import ijson  # optional: stream graph.json instead of loading it whole
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # optional: faster results.json encoding
+except ImportError:
+    orjson = None
+
 BENCH_DIR = Path("/tmp/rpg-bench")
+SEARCH_CACHE_DIR = BENCH_DIR / ".search-cache"
 SCRIPT_DIR = Path(__file__).parent
 QUERIES_FILE = SCRIPT_DIR / "queries.json"
 DEFAULT_BINARY = str(SCRIPT_DIR.parent / "target" / "release" / "rpg-encoder")
 
+# Serializes console output from concurrent per-repo workers
+_print_lock = threading.Lock()
+
+_ENTITY_RE = re.compile(rb"Entities:\s*(\d+)")
+_LIFTED_RE = re.compile(rb"Entities lifted:\s*(\d+)")
+_RESULT_RE = re.compile(rb"^\d+\.\s+(\S+)\s+\[(.+?):(\d+)\]\s+\(score:\s+([\d.]+)\)")
+
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -71,54 +102,85 @@ def find_binary():
     sys.exit(1)
 
 
-def run_cmd(args, timeout=300, stream_stderr=False):
-    """Run a command and return (stdout, stderr, returncode, elapsed)."""
+def run_cmd(args, timeout=300, stream_stderr=False, capture_stdout=True, progress_label=""):
+    """Run a command and return (stdout, stderr, returncode, elapsed).
+
+    When streaming, progress lines are prefixed with `[progress_label]` so
+    concurrent commands can be told apart.
+
+    stdout and stderr are raw bytes; parsers decode only the fields they
+    extract. With capture_stdout=False the child's stdout goes to /dev/null
+    and b"" is returned in its place.
+    """
     start = time.time()
+    stdout_target = subprocess.PIPE if capture_stdout else subprocess.DEVNULL
     try:
         if stream_stderr:
-            # Stream stderr line-by-line for progress
+            # Drain stdout and stderr together so neither pipe can fill up and
+            # block the child, echoing stderr progress lines as they arrive
             proc = subprocess.Popen(
                 args,
-                stdout=subprocess.PIPE,
+                stdout=stdout_target,
                 stderr=subprocess.PIPE,
-                text=True,
             )
-            stderr_lines = []
-            while True:
-                line = proc.stderr.readline()
-                if not line and proc.poll() is not None:
-                    break
-                if line:
-                    stderr_lines.append(line)
-                    line = line.strip()
-                    if line.startswith("Lifting batch"):
-                        # Print progress on same line
-                        print(f"\r    {line}", end="", flush=True)
-                    elif line and not line.startswith("Using LLM"):
-                        pass  # suppress other noise
-            stdout = proc.stdout.read()
-            stderr = "".join(stderr_lines)
-            rc = proc.returncode
+            out_fd = proc.stdout.fileno() if capture_stdout else None
+            err_fd = proc.stderr.fileno()
+            sel = selectors.DefaultSelector()
+            for fd in (out_fd, err_fd):
+                if fd is None:
+                    continue
+                os.set_blocking(fd, False)
+                sel.register(fd, selectors.EVENT_READ)
+            out, err, pending = bytearray(), bytearray(), b""
+            prefix = f"[{progress_label}] " if progress_label else ""
+            try:
+                while sel.get_map():
+                    if time.time() - start > timeout:
+                        proc.kill()
+                        proc.wait()
+                        raise subprocess.TimeoutExpired(args, timeout)
+                    for key, _ in sel.select(0.1):
+                        chunk = os.read(key.fd, 65536)
+                        if not chunk:
+                            sel.unregister(key.fd)
+                        elif key.fd == out_fd:
+                            out += chunk
+                        else:
+                            err += chunk
+                            *lines, pending = (pending + chunk).split(b"\n")
+                            for line in lines:
+                                line = line.decode(errors="replace").strip()
+                                if line.startswith("Lifting batch"):
+                                    # Print progress on same line
+                                    with _print_lock:
+                                        print(f"\r    {prefix}{line}", end="", flush=True)
+                                # other stderr noise is suppressed
+            finally:
+                sel.close()
+                if proc.stdout:
+                    proc.stdout.close()
+                proc.stderr.close()
+            rc = proc.wait()
             elapsed = time.time() - start
-            return stdout, stderr, rc, elapsed
+            return bytes(out), bytes(err), rc, elapsed
         else:
             result = subprocess.run(
                 args,
-                capture_output=True,
-                text=True,
+                stdout=stdout_target,
+                stderr=subprocess.PIPE,
                 timeout=timeout,
             )
             elapsed = time.time() - start
-            return result.stdout, result.stderr, result.returncode, elapsed
+            return result.stdout or b"", result.stderr, result.returncode, elapsed
     except subprocess.TimeoutExpired:
-        return "", "TIMEOUT", 1, timeout
+        return b"", b"TIMEOUT", 1, timeout
 
 
 def parse_entity_count(stderr):
     """Extract entity count from build stderr."""
-    for line in stderr.split("\n"):
-        if "Entities:" in line and "Lifted:" not in line:
-            m = re.search(r"Entities:\s*(\d+)", line)
+    for line in stderr.split(b"\n"):
+        if b"Entities:" in line and b"Lifted:" not in line:
+            m = _ENTITY_RE.search(line)
             if m:
                 return int(m.group(1))
     return 0
@@ -126,118 +188,184 @@ def parse_entity_count(stderr):
 
 def parse_lifted_count(stderr):
     """Extract lifted count from lift stderr."""
-    for line in stderr.split("\n"):
-        if "Entities lifted:" in line:
-            m = re.search(r"Entities lifted:\s*(\d+)", line)
+    for line in stderr.split(b"\n"):
+        if b"Entities lifted:" in line:
+            m = _LIFTED_RE.search(line)
             if m:
                 return int(m.group(1))
     return 0
 
 
+def _parse_result_line(line):
+    """Parse one `N. name [file:line] (score: S)` line with plain bytes ops.
+
+    Accepts only lines _RESULT_RE would also accept (single-token name,
+    unsigned integer line, digits-and-dots score); anything else returns
+    None so the caller falls back to the regex.
+    """
+    head, sep, rest = line.partition(b". ")
+    if not sep or not head.isdigit():
+        return None
+    score_at = rest.rfind(b" (score: ")
+    loc_at = rest.rfind(b" [", 0, score_at)
+    if score_at < 0 or loc_at < 0 or rest[score_at - 1:score_at] != b"]":
+        return None
+    name = rest[:loc_at].strip()
+    file, _, line_no = rest[loc_at + 2:score_at - 1].rpartition(b":")
+    score = rest[score_at + 9:-1]
+    if (
+        not rest.endswith(b")")
+        or len(name.split()) != 1
+        or not file
+        or not line_no.isdigit()
+        or not score
+        or score.strip(b"0123456789.")
+    ):
+        return None
+    try:
+        return {
+            "name": name.decode(errors="replace"),
+            "file": file.decode(errors="replace"),
+            "line": int(line_no),
+            "score": float(score),
+        }
+    except ValueError:
+        return None
+
+
 def parse_search_results(stdout):
-    """Parse search output into structured results."""
+    """Parse search output (bytes) into structured results."""
     results = []
-    for line in stdout.strip().split("\n"):
-        if not line.strip():
+    for line in stdout.strip().split(b"\n"):
+        # Result lines start with their rank; skips blanks and "features:" lines
+        if not line[:1].isdigit():
             continue
-        m = re.match(
-            r"^\d+\.\s+(\S+)\s+\[(.+?):(\d+)\]\s+\(score:\s+([\d.]+)\)", line
-        )
-        if m:
-            results.append({
-                "name": m.group(1),
-                "file": m.group(2),
-                "line": int(m.group(3)),
-                "score": float(m.group(4)),
-            })
+        result = _parse_result_line(line)
+        if result is None:
+            # Unusual formatting — fall back to the regex
+            m = _RESULT_RE.match(line)
+            if m:
+                result = {
+                    "name": m.group(1).decode(errors="replace"),
+                    "file": m.group(2).decode(errors="replace"),
+                    "line": int(m.group(3)),
+                    "score": float(m.group(4)),
+                }
+        if result:
+            results.append(result)
     return results
 
 
 def find_rank(results, expected_files):
-    """Find rank (1-indexed) of first matching result, or 0 if miss."""
+    """Find rank (1-indexed) of first matching result, or 0 if miss.
+
+    expected_files should be a set (see q["_expect_set"]).
+    """
     for i, r in enumerate(results):
-        # Extract the filename from the path (e.g., "src/search.rs" -> "search.rs")
-        result_filename = os.path.basename(r["file"])
-        for exp in expected_files:
-            if exp == result_filename:
-                return i + 1
+        # Compare the filename only (e.g., "src/search.rs" -> "search.rs")
+        if r["file"].rsplit("/", 1)[-1] in expected_files:
+            return i + 1
     return 0
 
 
-def graph_exists(repo_dir):
-    """Check if an RPG graph exists for this repo."""
-    return (repo_dir / ".rpg" / "graph.json").exists()
+def _graph_mtime(graph_file):
+    """Return graph.json's mtime in ns, or None if it doesn't exist."""
+    try:
+        return os.stat(graph_file).st_mtime_ns
+    except FileNotFoundError:
+        return None
 
 
-def graph_is_lifted(repo_dir):
-    """Check if the RPG graph has any lifted entities."""
-    graph_file = repo_dir / ".rpg" / "graph.json"
-    if not graph_file.exists():
-        return False
+def _iter_entities(graph_file):
+    """Yield entity values from graph.json, streaming when ijson is available."""
+    with open(graph_file, "rb") as f:
+        if ijson is not None:
+            for _, e in ijson.kvitems(f, "entities"):
+                yield e
+        else:
+            yield from json.load(f).get("entities", {}).values()
+
+
+@lru_cache(maxsize=64)
+def _graph_stats(graph_file, mtime_ns):
+    """(total, lifted) entity counts for one version of graph.json.
+
+    Keyed on mtime so the cache invalidates itself after build/lift rewrite
+    the graph.
+    """
+    total = lifted = 0
     try:
-        with open(graph_file) as f:
-            g = json.load(f)
-        for e in g.get("entities", {}).values():
+        for e in _iter_entities(graph_file):
+            total += 1
             if isinstance(e, dict) and e.get("semantic_features"):
-                return True
+                lifted += 1
     except Exception:
-        pass
-    return False
+        return 0, 0
+    return total, lifted
+
 
+def _load_graph_info(repo_dir):
+    """Summarize a repo's graph.json in one read.
 
-def count_lifted(repo_dir):
-    """Count lifted entities in graph."""
+    Returns {"exists", "total", "lifted", "is_lifted", "mtime_ns"}; the counts
+    come from the mtime-keyed _graph_stats cache.
+    """
     graph_file = repo_dir / ".rpg" / "graph.json"
-    if not graph_file.exists():
-        return 0, 0
-    try:
-        with open(graph_file) as f:
-            g = json.load(f)
-        entities = g.get("entities", {})
-        total = len(entities)
-        lifted = sum(
-            1 for e in entities.values()
-            if isinstance(e, dict) and e.get("semantic_features")
-        )
-        return total, lifted
-    except Exception:
-        return 0, 0
+    mtime = _graph_mtime(graph_file)
+    if mtime is None:
+        return {"exists": False, "total": 0, "lifted": 0, "is_lifted": False,
+                "mtime_ns": None}
+    total, lifted = _graph_stats(str(graph_file), mtime)
+    return {"exists": True, "total": total, "lifted": lifted, "is_lifted": lifted > 0,
+            "mtime_ns": mtime}
 
 
 # ── Phase 1: Prepare ────────────────────────────────────────────────────────
 
-def get_repo_dir(repo_config):
-    """Get the working directory for a repo (clone or copy as needed)."""
+def _link_or_copy(src, dst):
+    """Hardlink src to dst, falling back to a real copy (e.g. across filesystems)."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def get_repo_dir(repo_config, log):
+    """Get the working directory for a repo (clone or copy as needed).
+
+    Status lines are appended to `log` rather than printed.
+    """
     name = repo_config["name"]
 
     # Local repo: copy to bench dir (preserves source, isolates .rpg data)
     if "local_path" in repo_config:
         local_path = Path(repo_config["local_path"]).resolve()
-        if not local_path.exists():
+        if not os.path.exists(local_path):
             # Resolve relative to script dir's parent (project root)
             local_path = SCRIPT_DIR.parent / repo_config["local_path"]
             local_path = local_path.resolve()
         repo_dir = BENCH_DIR / name
-        if repo_dir.exists():
+        if os.path.isdir(repo_dir):
             return repo_dir
-        print(f"    Copying {local_path} -> {repo_dir}...")
+        log.append(f"    Copying {local_path} -> {repo_dir}...")
         BENCH_DIR.mkdir(parents=True, exist_ok=True)
-        # Copy source files only (skip .rpg, target, .git)
-        subprocess.run(
-            ["rsync", "-a", "--exclude", ".rpg", "--exclude", "target",
-             "--exclude", ".git", str(local_path) + "/", str(repo_dir) + "/"],
-            capture_output=True,
-            timeout=120,
+        # Copy source files only (skip .rpg, target, .git). Sources are never
+        # modified by the benchmark, so hardlinks make the copy nearly free.
+        shutil.copytree(
+            local_path, repo_dir,
+            symlinks=True,
+            copy_function=_link_or_copy,
+            ignore=shutil.ignore_patterns(".rpg", "target", ".git"),
         )
         return repo_dir
 
     # Remote repo: clone
     short_name = name.split("/")[1] if "/" in name else name
     repo_dir = BENCH_DIR / short_name
-    if repo_dir.exists():
+    if os.path.isdir(repo_dir):
         return repo_dir
     url = repo_config["url"]
-    print(f"    Cloning {name}...")
+    log.append(f"    Cloning {name}...")
     BENCH_DIR.mkdir(parents=True, exist_ok=True)
     subprocess.run(
         ["git", "clone", "--depth", "1", url, str(repo_dir)],
@@ -250,73 +378,96 @@ def get_repo_dir(repo_config):
 def build_graph(binary, repo_dir, language):
     """Build structural RPG graph. Excludes test/bench/example/fuzz files."""
     rpg_dir = repo_dir / ".rpg"
-    if rpg_dir.exists():
+    if os.path.isdir(rpg_dir):
         shutil.rmtree(rpg_dir)
-    stdout, stderr, rc, elapsed = run_cmd(
+    _, stderr, rc, elapsed = run_cmd(
         [binary, "build", "--lang", language, "-p", str(repo_dir),
          "--exclude", "*test*", "--exclude", "*bench*",
-         "--exclude", "*example*", "--exclude", "*fuzz*"]
+         "--exclude", "*example*", "--exclude", "*fuzz*"],
+        capture_stdout=False,
     )
     entities = parse_entity_count(stderr)
     return entities, elapsed, rc, stderr
 
 
-def lift_all(binary, repo_dir):
-    """Lift all entities with streaming progress."""
-    stdout, stderr, rc, elapsed = run_cmd(
+def lift_all(binary, repo_dir, label=""):
+    """Lift all entities with streaming progress (labelled with `label`)."""
+    _, stderr, rc, elapsed = run_cmd(
         [binary, "lift", "all", "-p", str(repo_dir)],
         timeout=3600,
         stream_stderr=True,
+        capture_stdout=False,
+        progress_label=label,
     )
     lifted = parse_lifted_count(stderr)
     return lifted, elapsed, rc
 
 
+def _prepare_one_repo(binary, repo_config, force_rebuild, force_lift, no_lift):
+    """Clone/copy, build, and lift one repo. Returns (name, repo_dir, log_lines).
+
+    Output is buffered into log_lines so concurrent repos print as whole blocks.
+    """
+    name = repo_config["name"]
+    language = repo_config["language"]
+    log = [f"\n  [{name}] ({language})"]
+
+    # Get repo directory (clone or copy)
+    repo_dir = get_repo_dir(repo_config, log)
+
+    # Build (skip if graph exists and not forced)
+    info = _load_graph_info(repo_dir)
+    needs_build = force_rebuild or force_lift or not info["exists"]
+    if needs_build:
+        entities, build_time, rc, stderr = build_graph(binary, repo_dir, language)
+        if rc != 0:
+            log.append(f"    Building graph... FAILED (rc={rc})")
+            log.append(f"    stderr: {stderr[:200].decode(errors='replace')}")
+            return name, repo_dir, log
+        log.append(f"    Building graph... {entities} entities in {build_time:.1f}s")
+        info = _load_graph_info(repo_dir)
+    else:
+        status = f", {info['lifted']} lifted" if info["lifted"] > 0 else ""
+        log.append(f"    Graph cached ({info['total']} entities{status})")
+
+    # Lift (skip if already lifted and not forced)
+    if no_lift:
+        log.append(f"    Lifting: SKIPPED (--no-lift)")
+    elif force_lift or not info["is_lifted"]:
+        log.append(f"    Lifting {info['total']} entities with Ollama...")
+        lifted, lift_time, rc = lift_all(binary, repo_dir, label=name)
+        if rc != 0:
+            log.append(f"    Lifting FAILED (rc={rc})")
+        else:
+            log.append(f"    {lifted} entities lifted in {lift_time:.1f}s")
+    else:
+        log.append(f"    Already lifted ({info['lifted']} entities)")
+
+    return name, repo_dir, log
+
+
 def prepare_repos(binary, config, force_rebuild=False, force_lift=False, no_lift=False):
-    """Phase 1: Clone, build, lift all repos. Returns repo_dirs dict."""
+    """Phase 1: Clone, build, lift all repos. Returns repo_dirs dict.
+
+    Repos are independent, so they are prepared concurrently; this overlaps
+    one repo's LLM lifting latency with another's build.
+    """
     print("Phase 1: PREPARE")
     print("─" * 78)
+    repos = config["repos"]
     repo_dirs = {}
 
-    for repo_config in config["repos"]:
-        name = repo_config["name"]
-        language = repo_config["language"]
-
-        print(f"\n  [{name}] ({language})")
-
-        # Get repo directory (clone or copy)
-        repo_dir = get_repo_dir(repo_config)
-        repo_dirs[name] = repo_dir
-
-        # Build (skip if graph exists and not forced)
-        needs_build = force_rebuild or force_lift or not graph_exists(repo_dir)
-        if needs_build:
-            print(f"    Building graph...", end=" ", flush=True)
-            entities, build_time, rc, stderr = build_graph(binary, repo_dir, language)
-            if rc != 0:
-                print(f"FAILED (rc={rc})")
-                print(f"    stderr: {stderr[:200]}")
-                continue
-            print(f"{entities} entities in {build_time:.1f}s")
-        else:
-            total, lifted = count_lifted(repo_dir)
-            status = f", {lifted} lifted" if lifted > 0 else ""
-            print(f"    Graph cached ({total} entities{status})")
-
-        # Lift (skip if already lifted and not forced)
-        if no_lift:
-            print(f"    Lifting: SKIPPED (--no-lift)")
-        elif force_lift or (not graph_is_lifted(repo_dir) and not no_lift):
-            total, _ = count_lifted(repo_dir)
-            print(f"    Lifting {total} entities with Ollama...", flush=True)
-            lifted, lift_time, rc = lift_all(binary, repo_dir)
-            if rc != 0:
-                print(f"\n    Lifting FAILED (rc={rc})")
-            else:
-                print(f"\n    {lifted} entities lifted in {lift_time:.1f}s")
-        else:
-            _, lifted = count_lifted(repo_dir)
-            print(f"    Already lifted ({lifted} entities)")
+    with ThreadPoolExecutor(max_workers=max(1, min(4, len(repos)))) as pool:
+        futures = [
+            pool.submit(_prepare_one_repo, binary, repo_config,
+                        force_rebuild, force_lift, no_lift)
+            for repo_config in repos
+        ]
+        for fut in as_completed(futures):
+            name, repo_dir, log = fut.result()
+            repo_dirs[name] = repo_dir
+            with _print_lock:
+                print("\n".join(log), flush=True)
 
     print()
     return repo_dirs
@@ -324,11 +475,168 @@ def prepare_repos(binary, config, force_rebuild=False, force_lift=False, no_lift
 
 # ── Phase 2: Measure ────────────────────────────────────────────────────────
 
-def measure_search(binary, config, repo_dirs):
-    """Phase 2: Run all search queries and compute metrics."""
+def _pump_lines(stream, lines):
+    """Forward a server's stdout lines into a queue; None marks EOF."""
+    for line in stream:
+        lines.put(line)
+    lines.put(None)
+
+
+def start_search_server(binary, repo_dir):
+    """Start a long-lived `search-server` worker that loads the graph once.
+
+    repo_dir is the repo path as a string. Returns (proc, lines), where a
+    reader thread feeds the server's stdout into the `lines` queue so
+    replies can be awaited with a deadline.
+    """
+    proc = subprocess.Popen(
+        [binary, "search-server", "-p", repo_dir],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        env={**os.environ, "RUST_LOG": "off"},
+    )
+    lines = queue.Queue()
+    threading.Thread(target=_pump_lines, args=(proc.stdout, lines), daemon=True).start()
+    return proc, lines
+
+
+def search_server_query(server, query, mode, timeout=300):
+    """Send one query to a search server. Returns results, or None if unavailable.
+
+    A server that doesn't answer within timeout seconds is killed, so later
+    queries on it fall back to the CLI straight away.
+    """
+    proc, lines = server
+    if proc.poll() is not None:
+        return None  # server exited (e.g. binary predates search-server)
+    try:
+        proc.stdin.write(json.dumps({"query": query, "mode": mode}) + "\n")
+        proc.stdin.flush()
+    except OSError:
+        return None
+    deadline = time.time() + timeout
+    while True:
+        try:
+            line = lines.get(timeout=max(0.0, deadline - time.time()))
+        except queue.Empty:
+            proc.kill()
+            return None
+        if line is None:
+            return None
+        if line.startswith("{"):
+            break
+    try:
+        response = json.loads(line)
+    except ValueError:
+        return None
+    return response.get("results") if isinstance(response, dict) else None
+
+
+def stop_search_server(server):
+    """Send the blank-line sentinel and wait for the server to exit."""
+    proc, _ = server
+    try:
+        proc.stdin.write("\n")
+        proc.stdin.close()
+        proc.wait(timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        proc.kill()
+        proc.wait()
+
+
+def _run_query(binary, repo_dir, mode, idx, q, servers):
+    """Run one search query (repo_dir as a string).
+
+    Returns (mode, idx, results, rank, ok); ok is False when neither the
+    server nor the CLI produced a valid answer, so the results must not be
+    cached.
+    """
+    server = servers.get()
+    try:
+        results = search_server_query(server, q["query"], mode)
+    finally:
+        servers.put(server)
+    ok = results is not None
+    if not ok:
+        # Fall back to one process per query
+        stdout, _, rc, _ = run_cmd([binary, "search", q["query"], "--mode", mode,
+                                    "-p", repo_dir])
+        results = parse_search_results(stdout)
+        ok = rc == 0
+    return mode, idx, results, find_rank(results, q["_expect_set"]), ok
+
+
+def _file_sha256(path):
+    """Hex SHA-256 of a file's contents."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _search_settings_digest(repo_dir):
+    """Fingerprint the search settings the binary reads besides the graph.
+
+    Covers `.rpg/config.toml` (hashed by content) and the RPG_SEARCH_LIMIT
+    override, both of which change the result limit.
+    """
+    config_file = os.path.join(repo_dir, ".rpg", "config.toml")
+    try:
+        config_sha = _file_sha256(config_file)
+    except FileNotFoundError:
+        config_sha = ""
+    return f"{config_sha}:{os.environ.get('RPG_SEARCH_LIMIT', '')}"
+
+
+def _search_cache_key(binary_sha, repo_dir, graph_mtime_ns, settings, query, mode):
+    """Cache key for one search: changes whenever the binary, graph or settings do."""
+    h = hashlib.sha256()
+    for part in (binary_sha, repo_dir, graph_mtime_ns, settings, query, mode):
+        h.update(str(part).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _search_cache_load(key):
+    """Return cached parsed results for key, or None on a miss."""
+    try:
+        with open(SEARCH_CACHE_DIR / f"{key}.json") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _search_cache_store(key, results):
+    """Persist parsed results for key (atomically, so readers never see partial files)."""
+    SEARCH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = SEARCH_CACHE_DIR / f"{key}.json"
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(results, f)
+    os.replace(tmp, path)
+
+
+def _accumulate(totals, metrics):
+    """Add one repo's metrics into the running all-repos totals."""
+    for k in ("@1", "@3", "@5", "@10", "total"):
+        totals[k] += metrics[k]
+    totals["mrr_sum"] += metrics["mrr"]
+
+
+def measure_search(binary, config, repo_dirs, cache_search=True):
+    """Phase 2: Run all search queries and compute metrics.
+
+    With cache_search, parsed results are reused from SEARCH_CACHE_DIR when
+    the binary, graph, search settings, query and mode are all unchanged.
+    """
     print("Phase 2: MEASURE")
     print("─" * 78)
 
+    binary_sha = _file_sha256(binary) if cache_search else None
+
     all_unlifted = {"@1": 0, "@3": 0, "@5": 0, "@10": 0, "total": 0, "mrr_sum": 0.0}
     all_lifted = {"@1": 0, "@3": 0, "@5": 0, "@10": 0, "total": 0, "mrr_sum": 0.0}
     repo_results = []
@@ -337,47 +645,81 @@ def measure_search(binary, config, repo_dirs):
         name = repo_config["name"]
         language = repo_config["language"]
         queries = repo_config["queries"]
+        if not queries:
+            print(f"\n  [{name}] SKIP — no queries")
+            continue
         repo_dir = repo_dirs.get(name)
 
-        if not repo_dir or not graph_exists(repo_dir):
+        info = _load_graph_info(repo_dir) if repo_dir else None
+        if not info or not info["exists"]:
             print(f"\n  [{name}] SKIP — no graph")
             continue
 
-        total_entities, lifted_entities = count_lifted(repo_dir)
+        total_entities, lifted_entities = info["total"], info["lifted"]
+        repo_dir_s = str(repo_dir)  # passed to every search subprocess
         has_lifted = lifted_entities > 0
 
         print(f"\n  [{name}] {total_entities} entities, {lifted_entities} lifted")
 
-        # Run unlifted search (snippets mode — ignores semantic features)
-        unlifted_results = []
-        for q in queries:
-            results = parse_search_results(
-                run_cmd([binary, "search", q["query"], "--mode", "snippets",
-                         "-p", str(repo_dir)])[0]
-            )
-            rank = find_rank(results, q["expect"])
-            unlifted_results.append({
+        # Run unlifted (snippets mode — ignores semantic features) and lifted
+        # (auto mode — uses features if available) searches concurrently over
+        # a pool of search-server workers, so the graph is loaded once per
+        # worker instead of once per query.
+        modes = ["snippets", "auto"] if has_lifted else ["snippets"]
+        by_mode = {mode: [None] * len(queries) for mode in modes}
+        cache_keys = {}
+        settings = _search_settings_digest(repo_dir_s) if cache_search else None
+
+        def record(mode, idx, results, rank):
+            q = queries[idx]
+            by_mode[mode][idx] = {
                 "query": q["query"],
                 "expect": q["expect"],
                 "rank": rank,
                 "top5": [r["file"] for r in results[:5]],
-            })
-
-        # Run lifted search (auto mode — uses features if available)
-        lifted_results = []
-        if has_lifted:
-            for q in queries:
-                results = parse_search_results(
-                    run_cmd([binary, "search", q["query"], "--mode", "auto",
-                             "-p", str(repo_dir)])[0]
-                )
-                rank = find_rank(results, q["expect"])
-                lifted_results.append({
-                    "query": q["query"],
-                    "expect": q["expect"],
-                    "rank": rank,
-                    "top5": [r["file"] for r in results[:5]],
-                })
+            }
+
+        # Serve unchanged searches from the on-disk cache; only misses run
+        work = []
+        for mode in modes:
+            for idx, q in enumerate(queries):
+                if cache_search:
+                    key = _search_cache_key(
+                        binary_sha, repo_dir_s, info["mtime_ns"], settings,
+                        q["query"], mode,
+                    )
+                    cache_keys[mode, idx] = key
+                    results = _search_cache_load(key)
+                    if results is not None:
+                        record(mode, idx, results, find_rank(results, q["_expect_set"]))
+                        continue
+                work.append((mode, idx, q))
+        if cache_search:
+            print(f"    Search cache: {len(cache_keys) - len(work)}/{len(cache_keys)} hits")
+
+        # Each worker loads the graph itself, so keep the pool small:
+        # a few workers overlap searches without repeating the load per core
+        n_workers = min(4, os.cpu_count() or 1, len(work))
+        servers = queue.Queue()
+        for _ in range(n_workers):
+            servers.put(start_search_server(binary, repo_dir_s))
+        try:
+            if work:
+                with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                    futures = [
+                        pool.submit(_run_query, binary, repo_dir_s, mode, idx, q, servers)
+                        for mode, idx, q in work
+                    ]
+                    for fut in as_completed(futures):
+                        mode, idx, results, rank, ok = fut.result()
+                        record(mode, idx, results, rank)
+                        if cache_search and ok:
+                            _search_cache_store(cache_keys[mode, idx], results)
+        finally:
+            while not servers.empty():
+                stop_search_server(servers.get())
+        unlifted_results = by_mode["snippets"]
+        lifted_results = by_mode.get("auto", [])
 
         # Print per-query table
         print()
@@ -418,57 +760,59 @@ def measure_search(binary, config, repo_dirs):
         total = len(queries)
 
         def compute_metrics(results):
-            at1 = sum(1 for r in results if 0 < r["rank"] <= 1)
-            at3 = sum(1 for r in results if 0 < r["rank"] <= 3)
-            at5 = sum(1 for r in results if 0 < r["rank"] <= 5)
-            at10 = sum(1 for r in results if 0 < r["rank"] <= 10)
-            mrr = sum(1.0 / r["rank"] for r in results if r["rank"] > 0)
+            at1 = at3 = at5 = at10 = 0
+            mrr = 0.0
+            for r in results:
+                rank = r["rank"]
+                if rank <= 0:
+                    continue
+                mrr += 1.0 / rank
+                if rank <= 10:
+                    at10 += 1
+                    if rank <= 5:
+                        at5 += 1
+                        if rank <= 3:
+                            at3 += 1
+                            if rank <= 1:
+                                at1 += 1
             return {"@1": at1, "@3": at3, "@5": at5, "@10": at10, "total": total, "mrr": mrr}
 
         u_metrics = compute_metrics(unlifted_results)
         l_metrics = compute_metrics(lifted_results) if lifted_results else None
 
         # Accumulate
-        for k in ["@1", "@3", "@5", "@10"]:
-            all_unlifted[k] += u_metrics[k]
-        all_unlifted["total"] += total
-        all_unlifted["mrr_sum"] += u_metrics["mrr"]
-
+        _accumulate(all_unlifted, u_metrics)
         if l_metrics:
-            for k in ["@1", "@3", "@5", "@10"]:
-                all_lifted[k] += l_metrics[k]
-            all_lifted["total"] += total
-            all_lifted["mrr_sum"] += l_metrics["mrr"]
+            _accumulate(all_lifted, l_metrics)
 
-        # Per-repo summary
-        print()
-        print(f"    {'Metric':<8} {'Unlifted':>12}", end="")
-        if l_metrics:
-            print(f" {'Lifted':>12} {'Delta':>8}", end="")
-        print()
-        print(f"    {'─' * 8} {'─' * 12}", end="")
+        # Per-repo summary (built as whole lines, written at once)
+        header = f"    {'Metric':<8} {'Unlifted':>12}"
+        rule = f"    {'─' * 8} {'─' * 12}"
         if l_metrics:
-            print(f" {'─' * 12} {'─' * 8}", end="")
-        print()
+            header += f" {'Lifted':>12} {'Delta':>8}"
+            rule += f" {'─' * 12} {'─' * 8}"
+        lines = ["", header, rule]
 
         for k in ["@1", "@3", "@5", "@10"]:
             u_pct = u_metrics[k] / total * 100
             u_s = f"{u_metrics[k]}/{total} ({u_pct:.0f}%)"
-            print(f"    Acc{k:<5} {u_s:>12}", end="")
+            row = f"    Acc{k:<5} {u_s:>12}"
             if l_metrics:
                 l_pct = l_metrics[k] / total * 100
                 delta = l_pct - u_pct
                 l_s = f"{l_metrics[k]}/{total} ({l_pct:.0f}%)"
                 d_s = f"{delta:+.0f}%"
-                print(f" {l_s:>12} {d_s:>8}", end="")
-            print()
+                row += f" {l_s:>12} {d_s:>8}"
+            lines.append(row)
 
         u_mrr = u_metrics["mrr"] / total
-        print(f"    {'MRR':<8} {u_mrr:>12.3f}", end="")
+        row = f"    {'MRR':<8} {u_mrr:>12.3f}"
         if l_metrics:
             l_mrr = l_metrics["mrr"] / total
-            print(f" {l_mrr:>12.3f} {l_mrr - u_mrr:>+8.3f}", end="")
-        print()
+            row += f" {l_mrr:>12.3f} {l_mrr - u_mrr:>+8.3f}"
+        lines.append(row)
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
         repo_results.append({
             "name": name,
@@ -498,24 +842,18 @@ def bootstrap_mrr_ci(unlifted_ranks, lifted_ranks, n_iterations=1000, ci=0.95):
     n = len(unlifted_ranks)
     assert n == len(lifted_ranks), "rank lists must be same length"
 
-    def mrr(ranks):
-        return sum(1.0 / r if r > 0 else 0.0 for r in ranks) / len(ranks)
-
-    observed_delta = mrr(lifted_ranks) - mrr(unlifted_ranks)
-
-    random.seed(42)  # reproducible
-    deltas = []
-    for _ in range(n_iterations):
-        indices = [random.randint(0, n - 1) for _ in range(n)]
-        u_sample = [unlifted_ranks[i] for i in indices]
-        l_sample = [lifted_ranks[i] for i in indices]
-        deltas.append(mrr(l_sample) - mrr(u_sample))
-
-    deltas.sort()
     alpha = 1 - ci
-    lower_idx = int(alpha / 2 * n_iterations)
-    upper_idx = int((1 - alpha / 2) * n_iterations)
-    return observed_delta, deltas[lower_idx], deltas[upper_idx]
+    u = np.asarray(unlifted_ranks, dtype=np.float64)
+    l = np.asarray(lifted_ranks, dtype=np.float64)
+    u_rr = np.where(u > 0, 1.0 / np.maximum(u, 1), 0.0)
+    l_rr = np.where(l > 0, 1.0 / np.maximum(l, 1), 0.0)
+    observed_delta = float(l_rr.mean() - u_rr.mean())
+
+    # All resamples at once: (n_iterations, n) index matrix, seeded for reproducibility
+    idx = np.random.default_rng(42).integers(0, n, size=(n_iterations, n))
+    deltas = l_rr[idx].mean(axis=1) - u_rr[idx].mean(axis=1)
+    ci_lower, ci_upper = np.quantile(deltas, [alpha / 2, 1 - alpha / 2])
+    return observed_delta, float(ci_lower), float(ci_upper)
 
 
 def print_summary(all_unlifted, all_lifted, repo_results):
@@ -528,34 +866,33 @@ def print_summary(all_unlifted, all_lifted, repo_results):
     total_u = all_unlifted["total"]
     total_l = all_lifted["total"]
 
-    print()
-    print(f"  {'Metric':<8} {'Unlifted':>14}", end="")
+    header = f"  {'Metric':<8} {'Unlifted':>14}"
+    rule = f"  {'─' * 8} {'─' * 14}"
     if total_l > 0:
-        print(f" {'Lifted':>14} {'Delta':>8}", end="")
-    print()
-    print(f"  {'─' * 8} {'─' * 14}", end="")
-    if total_l > 0:
-        print(f" {'─' * 14} {'─' * 8}", end="")
-    print()
+        header += f" {'Lifted':>14} {'Delta':>8}"
+        rule += f" {'─' * 14} {'─' * 8}"
+    lines = ["", header, rule]
 
     for k in ["@1", "@3", "@5", "@10"]:
         u_pct = all_unlifted[k] / total_u * 100 if total_u > 0 else 0
         u_s = f"{all_unlifted[k]}/{total_u} ({u_pct:.0f}%)"
-        print(f"  Acc{k:<5} {u_s:>14}", end="")
+        row = f"  Acc{k:<5} {u_s:>14}"
         if total_l > 0:
             l_pct = all_lifted[k] / total_l * 100
             delta = l_pct - u_pct
             l_s = f"{all_lifted[k]}/{total_l} ({l_pct:.0f}%)"
             d_s = f"{delta:+.0f}%"
-            print(f" {l_s:>14} {d_s:>8}", end="")
-        print()
+            row += f" {l_s:>14} {d_s:>8}"
+        lines.append(row)
 
     u_mrr = all_unlifted["mrr_sum"] / total_u if total_u > 0 else 0
-    print(f"  {'MRR':<8} {u_mrr:>14.3f}", end="")
+    row = f"  {'MRR':<8} {u_mrr:>14.3f}"
     if total_l > 0:
         l_mrr = all_lifted["mrr_sum"] / total_l
-        print(f" {l_mrr:>14.3f} {l_mrr - u_mrr:>+8.3f}", end="")
-    print()
+        row += f" {l_mrr:>14.3f} {l_mrr - u_mrr:>+8.3f}"
+    lines.append(row)
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
     # Bootstrap confidence interval for MRR delta
     if total_l > 0 and repo_results:
@@ -640,8 +977,12 @@ def save_results(all_unlifted, all_lifted, repo_results, binary):
     if ci_data:
         data["summary"]["mrr_bootstrap_ci"] = ci_data
 
-    with open(results_file, "w") as f:
-        json.dump(data, f, indent=2)
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode()
+    with open(results_file, "wb") as f:
+        f.write(payload)
     print(f"Results saved to {results_file}")
     return results_file
 
@@ -670,6 +1011,8 @@ Examples:
                         help="Force re-lift all entities")
     parser.add_argument("--no-lift", action="store_true",
                         help="Skip lifting entirely (unlifted baseline only)")
+    parser.add_argument("--no-cache-search", action="store_true",
+                        help="Re-run every search instead of reusing cached results")
     parser.add_argument("--ci", action="store_true",
                         help="CI mode: exit with code 1 if lifting regresses MRR")
     args = parser.parse_args()
@@ -680,6 +1023,10 @@ Examples:
 
     with open(QUERIES_FILE) as f:
         config = json.load(f)
+    # Expected filenames as sets, built once for find_rank; "expect" stays for display
+    for r in config["repos"]:
+        for q in r["queries"]:
+            q["_expect_set"] = frozenset(q["expect"])
 
     total_queries = sum(len(r["queries"]) for r in config["repos"])
 
@@ -705,7 +1052,7 @@ Examples:
             name = rc["name"]
             short_name = name.split("/")[1] if "/" in name else name
             repo_dir = BENCH_DIR / short_name
-            if repo_dir.exists():
+            if os.path.isdir(repo_dir):
                 repo_dirs[name] = repo_dir
             else:
                 print(f"  WARNING: {repo_dir} not found — run without --measure-only first")
@@ -718,7 +1065,9 @@ Examples:
         )
 
     # Phase 2: Measure
-    all_unlifted, all_lifted, repo_results = measure_search(binary, config, repo_dirs)
+    all_unlifted, all_lifted, repo_results = measure_search(
+        binary, config, repo_dirs, cache_search=not args.no_cache_search,
+    )
 
     # Summary + save
     print_summary(all_unlifted, all_lifted, repo_results)
@@ -70,6 +70,10 @@ enum Commands {
         file_pattern: Option<String>,
     },
 
+    /// Serve line-delimited JSON search requests on stdin (used by benchmarks)
+    #[command(hide = true)]
+    SearchServer,
+
     /// Fetch detailed info about a specific entity
     Fetch {
         /// Entity ID
@@ -205,6 +209,7 @@ fn main() -> Result<()> {
             line_range.as_deref(),
             file_pattern.as_deref(),
         ),
+        Commands::SearchServer => cmd_search_server(&project_root),
         Commands::Fetch { entity_id } => cmd_fetch(&project_root, &entity_id),
         Commands::Explore {
             entity_id,
@@ -648,6 +653,14 @@ fn cmd_update(project_root: &Path, since: Option<String>) -> Result<()> {
     Ok(())
 }
 
+fn parse_search_mode(mode: &str) -> rpg_nav::search::SearchMode {
+    match mode {
+        "features" => rpg_nav::search::SearchMode::Features,
+        "snippets" => rpg_nav::search::SearchMode::Snippets,
+        _ => rpg_nav::search::SearchMode::Auto,
+    }
+}
+
 fn cmd_search(
     project_root: &Path,
     query: &str,
@@ -658,11 +671,7 @@ fn cmd_search(
 ) -> Result<()> {
     let graph = rpg_core::storage::load(project_root)?;
     let config = RpgConfig::load(project_root)?;
-    let search_mode = match mode {
-        "features" => rpg_nav::search::SearchMode::Features,
-        "snippets" => rpg_nav::search::SearchMode::Snippets,
-        _ => rpg_nav::search::SearchMode::Auto,
-    };
+    let search_mode = parse_search_mode(mode);
 
     let limit = config.navigation.search_result_limit;
 
@@ -715,6 +724,66 @@ fn cmd_search(
     Ok(())
 }
 
+/// Long-lived search loop: loads the graph once, then answers one JSON request
+/// per stdin line (`{"query": "...", "mode": "auto"}`) with one JSON line
+/// (`{"results": [{"name", "file", "line", "score"}, ...]}`). A blank line or
+/// EOF ends the session.
+fn cmd_search_server(project_root: &Path) -> Result<()> {
+    use std::io::{BufRead, Write};
+
+    let graph = rpg_core::storage::load(project_root)?;
+    let config = RpgConfig::load(project_root)?;
+    let limit = config.navigation.search_result_limit;
+
+    let stdin = std::io::stdin();
+    let mut stdout = std::io::stdout().lock();
+    for line in stdin.lock().lines() {
+        let line = line?;
+        if line.trim().is_empty() {
+            break;
+        }
+
+        let response = match serde_json::from_str::<serde_json::Value>(&line) {
+            Ok(request) => {
+                let query = request["query"].as_str().unwrap_or_default();
+                let mode = request["mode"].as_str().unwrap_or("auto");
+                let results = rpg_nav::search::search_with_params(
+                    &graph,
+                    &rpg_nav::search::SearchParams {
+                        query,
+                        mode: parse_search_mode(mode),
+                        scope: None,
+                        limit,
+                        line_nums: None,
+                        file_pattern: None,
+                        entity_type_filter: None,
+                        embedding_scores: None,
+                        diff_context: None,
+                    },
+                );
+                let results: Vec<serde_json::Value> = results
+                    .iter()
+                    .map(|r| {
+                        serde_json::json!({
+                            "name": r.entity_name,
+                            "file": r.file,
+                            "line": r.line_start,
+                            "score": r.score,
+                        })
+                    })
+                    .collect();
+                serde_json::json!({ "results": results })
+            }
+            Err(e) => serde_json::json!({ "error": format!("invalid request: {}", e) }),
+        };
+
+        writeln!(stdout, "{}", response)?;
+        stdout.flush()?;
+    }
+
+    Ok(())
+}
+
 fn cmd_fetch(project_root: &Path, entity_id: &str) -> Result<()> {
     let graph = rpg_core::storage::load(project_root)?;
     let output = rpg_nav::fetch::fetch(&graph, entity_id, project_root)?;
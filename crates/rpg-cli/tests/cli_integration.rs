@@ -89,3 +89,66 @@ fn test_config_defaults_without_file() {
     assert_eq!(config.encoding.batch_size, 50);
     assert_eq!(config.encoding.max_batch_tokens, 8000);
 }
+
+#[test]
+fn test_search_server_protocol() {
+    use std::io::{BufRead, BufReader, Write};
+    use std::process::{Command, Stdio};
+
+    let tmpdir = tempfile::tempdir().unwrap();
+    let mut graph = RPGraph::new("rust");
+    graph.insert_entity(make_entity("main.rs:main", "main", "main.rs"));
+    graph.refresh_metadata();
+    rpg_core::storage::save(tmpdir.path(), &graph).unwrap();
+
+    let mut child = Command::new(env!("CARGO_BIN_EXE_rpg-encoder"))
+        .arg("search-server")
+        .arg("-p")
+        .arg(tmpdir.path())
+        .env("RUST_LOG", "off")
+        .stdin(Stdio::piped())
+        .stdout(Stdio::piped())
+        .spawn()
+        .unwrap();
+    let mut stdin = child.stdin.take().unwrap();
+    let mut stdout = BufReader::new(child.stdout.take().unwrap());
+    let mut roundtrip = |request: &str| -> serde_json::Value {
+        writeln!(stdin, "{}", request).unwrap();
+        stdin.flush().unwrap();
+        let mut line = String::new();
+        stdout.read_line(&mut line).unwrap();
+        serde_json::from_str(&line).unwrap()
+    };
+
+    // One request line -> one {"results": [{name, file, line, score}]} line
+    let response = roundtrip(r#"{"query": "main", "mode": "snippets"}"#);
+    let results = response["results"].as_array().unwrap();
+    assert!(!results.is_empty());
+    assert_eq!(results[0]["name"], "main");
+    assert_eq!(results[0]["file"], "main.rs");
+    assert_eq!(results[0]["line"], 1);
+    assert!(results[0]["score"].is_number());
+
+    // Malformed requests get an error line and the session continues
+    let response = roundtrip("not json");
+    assert!(response["error"].is_string());
+    let response = roundtrip(r#"{"query": "main", "mode": "auto"}"#);
+    assert!(response["results"].is_array());
+
+    // A blank line ends the session even with stdin still open
+    writeln!(stdin).unwrap();
+    stdin.flush().unwrap();
+    let deadline = std::time::Instant::now() + std::time::Duration::from_secs(10);
+    let status = loop {
+        if let Some(status) = child.try_wait().unwrap() {
+            break status;
+        }
+        if std::time::Instant::now() > deadline {
+            child.kill().unwrap();
+            panic!("search-server did not exit on blank line");
+        }
+        std::thread::sleep(std::time::Duration::from_millis(20));
+    };
+    assert!(status.success());
+    drop(stdin);
+}